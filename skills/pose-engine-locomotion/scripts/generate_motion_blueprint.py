@@ -5,146 +5,196 @@ from __future__ import annotations
 
 import argparse
 import json
-from typing import Any, Dict
+from typing import Any, Callable, Dict, NamedTuple, Tuple
 
 
 Action = str
 Mode = str
 
 
-def _walk_payload(direction: int, mode: Mode, stride: float, lift: float) -> Dict[str, Any]:
-    payload: Dict[str, Any] = {
-        "root_delta": {
-            "x": direction * stride * 0.55,
-            "y": 0,
-        },
-        "notes": [
-            "Use alternating gait phase state for repeated walk commands.",
-            "Direction +1 means right/forward; -1 means left/backward.",
-        ],
-    }
+class _Params(NamedTuple):
+    mode: Mode
+    stride: float
+    lift: float
+    jump_height: float
+    nudge_step: float
+    crouch_drop: float
+    dash_distance: float
+
+
+IkTargets = Tuple[Tuple[str, float, float], ...]
+FkRotations = Tuple[Tuple[str, float], ...]
+
+
+class Payload(NamedTuple):
+    """Immutable blueprint payload; converted to the JSON shape by payload_to_dict."""
+
+    root_dx: float
+    root_dy: float
+    notes: Tuple[str, ...]
+    ik_targets: IkTargets = ()
+    fk_rotations_deg: FkRotations = ()
+
+
+# (target, dx per unit reach, dy per unit lift); reach already carries direction.
+_WALK_IK: IkTargets = (
+    ("swing_foot", 1.0, -1.0),
+    ("plant_foot", -0.3, 0),
+    ("lead_hand", 0.5, -0.3),
+    ("trail_hand", -0.5, 0.15),
+)
+_RUN_IK: IkTargets = (
+    ("swing_foot", 1.0, -1.0),
+    ("plant_foot", -0.32, 0),
+    ("lead_hand", 0.54, -0.42),
+    ("trail_hand", -0.54, 0.2),
+)
 
+_WALK_NOTES = (
+    "Use alternating gait phase state for repeated walk commands.",
+    "Direction +1 means right/forward; -1 means left/backward.",
+)
+_RUN_NOTES = (
+    "Use a separate run phase state from walk for cleaner cadence.",
+    "Tune run_lift first if feet over-penetrate ground.",
+)
+_JUMP_NOTES = ("Apply this as a tap impulse; use a separate landing command or gravity pass to settle.",)
+_NUDGE_NOTES = ("Nudge commands should be repeatable and small in magnitude.",)
+_CROUCH_NOTES = ("Treat crouch as a toggle pair: crouch_enter then crouch_exit.",)
+_DASH_NOTES = ("Dash should be a single non-repeating impulse.",)
+
+
+def _ik_targets(coeffs: IkTargets, reach: float, lift: float) -> IkTargets:
+    # Zero coefficients stay integer zeros so output matches hand-written payloads.
+    return tuple((name, reach * cx, lift * cy if cy else 0) for name, cx, cy in coeffs)
+
+
+def _walk_payload(direction: int, mode: Mode, stride: float, lift: float) -> Payload:
+    root_dx = direction * stride * 0.55
     if mode == "ik":
-        payload["ik_targets"] = {
-            "swing_foot": {"dx": direction * stride, "dy": -lift},
-            "plant_foot": {"dx": -direction * stride * 0.3, "dy": 0},
-            "lead_hand": {"dx": direction * stride * 0.5, "dy": -lift * 0.3},
-            "trail_hand": {"dx": -direction * stride * 0.5, "dy": lift * 0.15},
-        }
-    else:
-        payload["fk_rotations_deg"] = {
-            "l_hip": -34 * direction,
-            "r_hip": 10 * direction,
-            "l_knee": 24,
-            "r_knee": -18,
-            "l_shoulder": 22 * direction,
-            "r_shoulder": -22 * direction,
-        }
-
-    return payload
-
-
-def _run_payload(direction: int, mode: Mode, stride: float, lift: float) -> Dict[str, Any]:
+        return Payload(root_dx, 0, _WALK_NOTES, ik_targets=_ik_targets(_WALK_IK, direction * stride, lift))
+    return Payload(
+        root_dx,
+        0,
+        _WALK_NOTES,
+        fk_rotations_deg=(
+            ("l_hip", -34 * direction),
+            ("r_hip", 10 * direction),
+            ("l_knee", 24),
+            ("r_knee", -18),
+            ("l_shoulder", 22 * direction),
+            ("r_shoulder", -22 * direction),
+        ),
+    )
+
+
+def _run_payload(direction: int, mode: Mode, stride: float, lift: float) -> Payload:
     run_stride = stride * 1.65
     run_lift = lift * 1.3
-    payload: Dict[str, Any] = {
-        "root_delta": {
-            "x": direction * run_stride * 0.54,
-            "y": 0,
-        },
-        "notes": [
-            "Use a separate run phase state from walk for cleaner cadence.",
-            "Tune run_lift first if feet over-penetrate ground.",
-        ],
-    }
-
+    root_dx = direction * run_stride * 0.54
     if mode == "ik":
-        payload["ik_targets"] = {
-            "swing_foot": {"dx": direction * run_stride, "dy": -run_lift},
-            "plant_foot": {"dx": -direction * run_stride * 0.32, "dy": 0},
-            "lead_hand": {"dx": direction * run_stride * 0.54, "dy": -run_lift * 0.42},
-            "trail_hand": {"dx": -direction * run_stride * 0.54, "dy": run_lift * 0.2},
-        }
-    else:
-        payload["fk_rotations_deg"] = {
-            "l_hip": -52 * direction,
-            "r_hip": 18 * direction,
-            "l_knee": 40,
-            "r_knee": -28,
-            "l_shoulder": 34 * direction,
-            "r_shoulder": -34 * direction,
-        }
-
-    return payload
-
-
-def _jump_payload(mode: Mode, jump_height: float) -> Dict[str, Any]:
-    payload: Dict[str, Any] = {
-        "root_delta": {
-            "x": 0,
-            "y": -jump_height,
-        },
-        "notes": [
-            "Apply this as a tap impulse; use a separate landing command or gravity pass to settle.",
-        ],
-    }
+        return Payload(root_dx, 0, _RUN_NOTES, ik_targets=_ik_targets(_RUN_IK, direction * run_stride, run_lift))
+    return Payload(
+        root_dx,
+        0,
+        _RUN_NOTES,
+        fk_rotations_deg=(
+            ("l_hip", -52 * direction),
+            ("r_hip", 18 * direction),
+            ("l_knee", 40),
+            ("r_knee", -28),
+            ("l_shoulder", 34 * direction),
+            ("r_shoulder", -34 * direction),
+        ),
+    )
+
 
+def _jump_payload(mode: Mode, jump_height: float) -> Payload:
     if mode == "ik":
-        payload["ik_targets"] = {
-            "l_foot": {"dx": -8, "dy": -jump_height * 0.57},
-            "r_foot": {"dx": 8, "dy": -jump_height * 0.57},
-            "l_hand": {"dx": -12, "dy": -jump_height * 0.75},
-            "r_hand": {"dx": 12, "dy": -jump_height * 0.75},
-        }
-    else:
-        payload["fk_rotations_deg"] = {
-            "l_hip": -42,
-            "r_hip": 42,
-            "l_knee": 34,
-            "r_knee": -34,
-            "l_shoulder": -78,
-            "r_shoulder": 78,
-        }
-
-    return payload
-
-
-def _nudge_payload(dx: float, dy: float) -> Dict[str, Any]:
-    return {
-        "root_delta": {"x": dx, "y": dy},
-        "notes": ["Nudge commands should be repeatable and small in magnitude."],
-    }
+        return Payload(
+            0,
+            -jump_height,
+            _JUMP_NOTES,
+            ik_targets=(
+                ("l_foot", -8, -jump_height * 0.57),
+                ("r_foot", 8, -jump_height * 0.57),
+                ("l_hand", -12, -jump_height * 0.75),
+                ("r_hand", 12, -jump_height * 0.75),
+            ),
+        )
+    return Payload(
+        0,
+        -jump_height,
+        _JUMP_NOTES,
+        fk_rotations_deg=(
+            ("l_hip", -42),
+            ("r_hip", 42),
+            ("l_knee", 34),
+            ("r_knee", -34),
+            ("l_shoulder", -78),
+            ("r_shoulder", 78),
+        ),
+    )
 
 
-def _crouch_payload(enter: bool, crouch_drop: float) -> Dict[str, Any]:
-    return {
-        "root_delta": {"x": 0, "y": crouch_drop if enter else -crouch_drop},
-        "notes": [
-            "Treat crouch as a toggle pair: crouch_enter then crouch_exit.",
-        ],
-        "fk_rotations_deg": {
-            "torso": 18 if enter else 0,
-            "l_hip": -22 if enter else -18,
-            "r_hip": 22 if enter else 18,
-            "l_knee": 62 if enter else 0,
-            "r_knee": -62 if enter else 0,
-        },
-    }
+def _nudge_payload(dx: float, dy: float) -> Payload:
+    return Payload(dx, dy, _NUDGE_NOTES)
 
 
-def _dash_payload(direction: int, dash_distance: float) -> Dict[str, Any]:
-    return {
-        "root_delta": {"x": direction * dash_distance, "y": -6},
-        "notes": [
-            "Dash should be a single non-repeating impulse.",
-        ],
-        "ik_targets": {
-            "lead_foot": {"dx": direction * (dash_distance * 0.53), "dy": -4},
-            "trail_foot": {"dx": -direction * 12, "dy": 0},
-            "lead_hand": {"dx": direction * 30, "dy": -12},
-            "trail_hand": {"dx": -direction * 30, "dy": 6},
-        },
+def _crouch_payload(enter: bool, crouch_drop: float) -> Payload:
+    return Payload(
+        0,
+        crouch_drop if enter else -crouch_drop,
+        _CROUCH_NOTES,
+        fk_rotations_deg=(
+            ("torso", 18 if enter else 0),
+            ("l_hip", -22 if enter else -18),
+            ("r_hip", 22 if enter else 18),
+            ("l_knee", 62 if enter else 0),
+            ("r_knee", -62 if enter else 0),
+        ),
+    )
+
+
+def _dash_payload(direction: int, dash_distance: float) -> Payload:
+    return Payload(
+        direction * dash_distance,
+        -6,
+        _DASH_NOTES,
+        ik_targets=(
+            ("lead_foot", direction * (dash_distance * 0.53), -4),
+            ("trail_foot", -direction * 12, 0),
+            ("lead_hand", direction * 30, -12),
+            ("trail_hand", -direction * 30, 6),
+        ),
+    )
+
+
+def payload_to_dict(payload: Payload) -> Dict[str, Any]:
+    out: Dict[str, Any] = {
+        "root_delta": {"x": payload.root_dx, "y": payload.root_dy},
+        "notes": list(payload.notes),
     }
+    if payload.ik_targets:
+        out["ik_targets"] = {name: {"dx": dx, "dy": dy} for name, dx, dy in payload.ik_targets}
+    if payload.fk_rotations_deg:
+        out["fk_rotations_deg"] = dict(payload.fk_rotations_deg)
+    return out
+
+
+_ACTIONS: Dict[Action, Callable[[_Params], Payload]] = {
+    "nudge_up": lambda p: _nudge_payload(0, -p.nudge_step),
+    "nudge_down": lambda p: _nudge_payload(0, p.nudge_step),
+    "walk_left": lambda p: _walk_payload(direction=-1, mode=p.mode, stride=p.stride, lift=p.lift),
+    "walk_right": lambda p: _walk_payload(direction=1, mode=p.mode, stride=p.stride, lift=p.lift),
+    "run_left": lambda p: _run_payload(direction=-1, mode=p.mode, stride=p.stride, lift=p.lift),
+    "run_right": lambda p: _run_payload(direction=1, mode=p.mode, stride=p.stride, lift=p.lift),
+    "jump": lambda p: _jump_payload(mode=p.mode, jump_height=p.jump_height),
+    "crouch_enter": lambda p: _crouch_payload(enter=True, crouch_drop=p.crouch_drop),
+    "crouch_exit": lambda p: _crouch_payload(enter=False, crouch_drop=p.crouch_drop),
+    "dash_left": lambda p: _dash_payload(direction=-1, dash_distance=p.dash_distance),
+    "dash_right": lambda p: _dash_payload(direction=1, dash_distance=p.dash_distance),
+}
 
 
 def build_payload(
@@ -156,30 +206,11 @@ def build_payload(
     nudge_step: float,
     crouch_drop: float,
     dash_distance: float,
-) -> Dict[str, Any]:
-    if action == "nudge_up":
-        return _nudge_payload(0, -nudge_step)
-    if action == "nudge_down":
-        return _nudge_payload(0, nudge_step)
-    if action == "walk_left":
-        return _walk_payload(direction=-1, mode=mode, stride=stride, lift=lift)
-    if action == "walk_right":
-        return _walk_payload(direction=1, mode=mode, stride=stride, lift=lift)
-    if action == "run_left":
-        return _run_payload(direction=-1, mode=mode, stride=stride, lift=lift)
-    if action == "run_right":
-        return _run_payload(direction=1, mode=mode, stride=stride, lift=lift)
-    if action == "jump":
-        return _jump_payload(mode=mode, jump_height=jump_height)
-    if action == "crouch_enter":
-        return _crouch_payload(enter=True, crouch_drop=crouch_drop)
-    if action == "crouch_exit":
-        return _crouch_payload(enter=False, crouch_drop=crouch_drop)
-    if action == "dash_left":
-        return _dash_payload(direction=-1, dash_distance=dash_distance)
-    if action == "dash_right":
-        return _dash_payload(direction=1, dash_distance=dash_distance)
-    raise ValueError(f"Unsupported action: {action}")
+) -> Payload:
+    handler = _ACTIONS.get(action)
+    if handler is None:
+        raise ValueError(f"Unsupported action: {action}")
+    return handler(_Params(mode, stride, lift, jump_height, nudge_step, crouch_drop, dash_distance))
 
 
 def parse_args() -> argparse.Namespace:
@@ -189,19 +220,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--action",
         required=True,
-        choices=[
-            "nudge_up",
-            "nudge_down",
-            "walk_left",
-            "walk_right",
-            "run_left",
-            "run_right",
-            "jump",
-            "crouch_enter",
-            "crouch_exit",
-            "dash_left",
-            "dash_right",
-        ],
+        choices=list(_ACTIONS),
         help="Shortcut action to scaffold.",
     )
     parser.add_argument(
@@ -266,7 +285,7 @@ def main() -> None:
             {
                 "action": args.action,
                 "mode": args.mode,
-                "payload": payload,
+                "payload": payload_to_dict(payload),
             },
             indent=2,
             sort_keys=True,
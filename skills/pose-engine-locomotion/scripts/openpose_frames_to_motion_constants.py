@@ -5,9 +5,15 @@ from __future__ import annotations
 
 import argparse
 import json
-import statistics
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 COCO_PARTS: List[str] = [
@@ -31,24 +37,45 @@ COCO_PARTS: List[str] = [
     "l_ear",
 ]
 
-XYC = Tuple[float, float, float]
+KEYPOINT_WIDTH = len(COCO_PARTS) * 3
+L_HIP = COCO_PARTS.index("l_hip")
+R_HIP = COCO_PARTS.index("r_hip")
+L_SHOULDER = COCO_PARTS.index("l_shoulder")
+R_SHOULDER = COCO_PARTS.index("r_shoulder")
+_LEFT_TORSO_JOINTS = [L_HIP, L_SHOULDER]
+_RIGHT_TORSO_JOINTS = [R_HIP, R_SHOULDER]
+
+# (key, lo, hi) clamp bounds, in output order.
+MOTION_CONSTANT_BOUNDS: Tuple[Tuple[str, float, float], ...] = (
+    ("WALK_SWING_FORWARD_PX", 20.0, 72.0),
+    ("WALK_SWING_LIFT_PX", 14.0, 42.0),
+    ("RUN_SWING_FORWARD_PX", 34.0, 112.0),
+    ("RUN_SWING_LIFT_PX", 20.0, 64.0),
+    ("JUMP_HEIGHT_PX", 24.0, 120.0),
+    ("CROUCH_ROOT_DROP_PX", 16.0, 56.0),
+    ("DASH_ROOT_ADVANCE_PX", 42.0, 140.0),
+    ("DASH_FOOT_DRIVE_PX", 24.0, 74.0),
+    ("ROOT_NUDGE_STEP_PX", 8.0, 26.0),
+    ("REFERENCE_BODY_SPAN_PX", 40.0, 240.0),
+)
+MOTION_CONSTANT_KEYS: Tuple[str, ...] = tuple(key for key, _, _ in MOTION_CONSTANT_BOUNDS)
+_CONSTANT_LO = np.array([lo for _, lo, _ in MOTION_CONSTANT_BOUNDS])
+_CONSTANT_HI = np.array([hi for _, _, hi in MOTION_CONSTANT_BOUNDS])
+
 Frame = Dict[str, Any]
 
 
-def _median(values: Sequence[float], fallback: float) -> float:
-    clean = [v for v in values if isinstance(v, (int, float))]
-    if not clean:
+def _median(values: np.ndarray, fallback: float) -> float:
+    if not values.size:
         return fallback
-    return float(statistics.median(clean))
-
-
-def _clamp(value: float, lo: float, hi: float) -> float:
-    return max(lo, min(hi, value))
+    return float(np.median(values))
 
 
 def _load_json(path: Path) -> Any:
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    raw = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 def _extract_people_entry(frame: Any) -> Optional[Dict[str, Any]]:
@@ -64,7 +91,7 @@ def _extract_people_entry(frame: Any) -> Optional[Dict[str, Any]]:
     return frame
 
 
-def _extract_keypoints_array(frame: Any) -> Optional[List[float]]:
+def _extract_keypoints_array(frame: Any) -> Optional[np.ndarray]:
     person = _extract_people_entry(frame)
     if not person:
         return None
@@ -72,12 +99,16 @@ def _extract_keypoints_array(frame: Any) -> Optional[List[float]]:
     arr = person.get(key)
     if not isinstance(arr, list):
         return None
-    if len(arr) < len(COCO_PARTS) * 3:
+    if len(arr) < KEYPOINT_WIDTH:
+        return None
+    row = np.asarray(arr[:KEYPOINT_WIDTH], dtype=np.float64)
+    # null keypoints become NaN under bulk conversion; drop the frame so NaN never reaches the stats.
+    if not np.isfinite(row).all():
         return None
-    return [float(v) for v in arr]
+    return row
 
 
-def _load_frames(payload: Any) -> List[List[float]]:
+def _load_frames(payload: Any) -> np.ndarray:
     if isinstance(payload, dict) and isinstance(payload.get("frames"), list):
         items = payload["frames"]
     elif isinstance(payload, list):
@@ -85,107 +116,118 @@ def _load_frames(payload: Any) -> List[List[float]]:
     else:
         items = [payload]
 
-    frames: List[List[float]] = []
+    rows: List[np.ndarray] = []
     for item in items:
         arr = _extract_keypoints_array(item)
-        if arr:
-            frames.append(arr)
-    return frames
-
-
-def _part(frame: List[float], name: str) -> Optional[XYC]:
-    idx = COCO_PARTS.index(name) * 3
-    x, y, c = frame[idx], frame[idx + 1], frame[idx + 2]
-    if c <= 0:
-        return None
-    return x, y, c
-
-
-def _midpoint(a: Optional[XYC], b: Optional[XYC], min_conf: float) -> Optional[Tuple[float, float]]:
-    if not a or not b:
-        return None
-    if a[2] < min_conf or b[2] < min_conf:
-        return None
-    return ((a[0] + b[0]) * 0.5, (a[1] + b[1]) * 0.5)
-
-
-def _stride_stats(hip_x: Sequence[float]) -> Tuple[float, float]:
-    deltas = [hip_x[i + 1] - hip_x[i] for i in range(len(hip_x) - 1)]
-    abs_deltas = [abs(d) for d in deltas if abs(d) > 1e-6]
+        if arr is not None:
+            rows.append(arr)
+    if not rows:
+        return np.empty((0, KEYPOINT_WIDTH), dtype=np.float64)
+    return np.stack(rows)
+
+
+def _torso_midpoints(frames: np.ndarray, min_conf: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (hip, shoulder) midpoint arrays, each masked by its own joint pair's confidence."""
+    joints = frames.reshape(len(frames), len(COCO_PARTS), 3)
+    left = joints[:, _LEFT_TORSO_JOINTS]
+    right = joints[:, _RIGHT_TORSO_JOINTS]
+    # Zero-confidence joints are missing detections regardless of min_conf.
+    conf = np.minimum(left[..., 2], right[..., 2])
+    mask = (conf > 0) & (conf >= min_conf)
+    mids = (left[..., :2] + right[..., :2]) * 0.5
+    return mids[mask[:, 0], 0], mids[mask[:, 1], 1]
+
+
+def _stride_stats(hip_x: np.ndarray) -> Tuple[float, float]:
+    abs_deltas = np.abs(np.diff(hip_x))
+    abs_deltas = abs_deltas[abs_deltas > 1e-6]
     walk_stride = _median(abs_deltas, 30.0) * 2.1
     run_stride = walk_stride * 1.65
     return walk_stride, run_stride
 
 
-def _dash_distance(hip_x: Sequence[float]) -> float:
-    deltas = sorted(abs(hip_x[i + 1] - hip_x[i]) for i in range(len(hip_x) - 1))
-    if not deltas:
+def _dash_distance(hip_x: np.ndarray) -> float:
+    abs_deltas = np.abs(np.diff(hip_x))
+    if not abs_deltas.size:
         return 64.0
-    p90_index = int(0.9 * (len(deltas) - 1))
-    return max(48.0, deltas[p90_index] * 4.5)
+    # "lower" keeps the nearest-rank p90 the script has always used.
+    p90 = float(np.percentile(abs_deltas, 90, method="lower"))
+    return max(48.0, p90 * 4.5)
 
 
-def derive_motion_constants(frames: List[List[float]], min_conf: float) -> Dict[str, float]:
-    hip_midpoints: List[Tuple[float, float]] = []
-    shoulder_midpoints: List[Tuple[float, float]] = []
+def _derive_core(frames: np.ndarray, min_conf: float) -> np.ndarray:
+    """Return the unrounded constants in MOTION_CONSTANT_KEYS order."""
+    hip, shoulder = _torso_midpoints(frames, min_conf)
 
-    for frame in frames:
-        l_hip = _part(frame, "l_hip")
-        r_hip = _part(frame, "r_hip")
-        l_shoulder = _part(frame, "l_shoulder")
-        r_shoulder = _part(frame, "r_shoulder")
-
-        hip_mid = _midpoint(l_hip, r_hip, min_conf)
-        shoulder_mid = _midpoint(l_shoulder, r_shoulder, min_conf)
-        if hip_mid:
-            hip_midpoints.append(hip_mid)
-        if shoulder_mid:
-            shoulder_midpoints.append(shoulder_mid)
-
-    if len(hip_midpoints) < 2:
+    if len(hip) < 2:
         raise ValueError("Not enough confident hip samples to derive motion constants.")
 
-    hip_x = [p[0] for p in hip_midpoints]
-    hip_y = [p[1] for p in hip_midpoints]
+    hip_x = hip[:, 0]
+    hip_y = hip[:, 1]
     walk_stride, run_stride = _stride_stats(hip_x)
     dash_distance = _dash_distance(hip_x)
 
-    baseline_hip_y = _median(hip_y, hip_y[0])
-    min_hip_y = min(hip_y)
-    max_hip_y = max(hip_y)
+    baseline_hip_y = float(np.median(hip_y))
+    min_hip_y = float(hip_y.min())
+    max_hip_y = float(hip_y.max())
     jump_height_px = max(12.0, baseline_hip_y - min_hip_y)
     crouch_drop_px = max(10.0, max_hip_y - baseline_hip_y)
 
-    shoulder_y = [p[1] for p in shoulder_midpoints] if shoulder_midpoints else hip_y
-    upper_motion = _median([abs(hip_y[i] - shoulder_y[min(i, len(shoulder_y) - 1)]) for i in range(len(hip_y))], 80.0)
+    shoulder_y = shoulder[:, 1] if len(shoulder) else hip_y
+    # Pair each hip sample with the matching shoulder sample, holding the last one if shoulders run short.
+    shoulder_idx = np.minimum(np.arange(len(hip_y)), len(shoulder_y) - 1)
+    upper_motion = _median(np.abs(hip_y - shoulder_y[shoulder_idx]), 80.0)
 
     # Convert image-space deltas into engine-friendly defaults.
     # This ratio is intentionally conservative and should be tuned on import output.
     px_to_world = 0.42
 
-    constants = {
-        "WALK_SWING_FORWARD_PX": _clamp(walk_stride * px_to_world, 20.0, 72.0),
-        "WALK_SWING_LIFT_PX": _clamp(jump_height_px * px_to_world * 0.42, 14.0, 42.0),
-        "RUN_SWING_FORWARD_PX": _clamp(run_stride * px_to_world, 34.0, 112.0),
-        "RUN_SWING_LIFT_PX": _clamp(jump_height_px * px_to_world * 0.58, 20.0, 64.0),
-        "JUMP_HEIGHT_PX": _clamp(jump_height_px * px_to_world, 24.0, 120.0),
-        "CROUCH_ROOT_DROP_PX": _clamp(crouch_drop_px * px_to_world, 16.0, 56.0),
-        "DASH_ROOT_ADVANCE_PX": _clamp(dash_distance * px_to_world, 42.0, 140.0),
-        "DASH_FOOT_DRIVE_PX": _clamp(dash_distance * px_to_world * 0.5, 24.0, 74.0),
-        "ROOT_NUDGE_STEP_PX": _clamp(_median([abs(x) for x in [walk_stride * px_to_world * 0.18]], 14.0), 8.0, 26.0),
-        "REFERENCE_BODY_SPAN_PX": _clamp(upper_motion, 40.0, 240.0),
+    raw = {
+        "WALK_SWING_FORWARD_PX": walk_stride * px_to_world,
+        "WALK_SWING_LIFT_PX": jump_height_px * px_to_world * 0.42,
+        "RUN_SWING_FORWARD_PX": run_stride * px_to_world,
+        "RUN_SWING_LIFT_PX": jump_height_px * px_to_world * 0.58,
+        "JUMP_HEIGHT_PX": jump_height_px * px_to_world,
+        "CROUCH_ROOT_DROP_PX": crouch_drop_px * px_to_world,
+        "DASH_ROOT_ADVANCE_PX": dash_distance * px_to_world,
+        "DASH_FOOT_DRIVE_PX": dash_distance * px_to_world * 0.5,
+        "ROOT_NUDGE_STEP_PX": walk_stride * px_to_world * 0.18,
+        "REFERENCE_BODY_SPAN_PX": upper_motion,
     }
-    return {k: round(v, 2) for k, v in constants.items()}
+    values = np.array([raw[key] for key in MOTION_CONSTANT_KEYS], dtype=np.float64)
+    return np.clip(values, _CONSTANT_LO, _CONSTANT_HI)
+
+
+def derive_motion_constants(frames: Union[np.ndarray, Sequence[Sequence[float]]], min_conf: float) -> Dict[str, float]:
+    # Accept plain lists of keypoint rows as well; a no-op for the float64 array _load_frames returns.
+    frames = np.asarray(frames, dtype=np.float64)
+    values = _derive_core(frames, min_conf)
+    return {key: round(float(v), 2) for key, v in zip(MOTION_CONSTANT_KEYS, values)}
+
+
+# Specialized for the known key set; braces around the object literal are escaped for str.format.
+_TS_TEMPLATE = (
+    "// Generated from OpenPose-style frames\nexport const LOCOMOTION_TUNING = {{\n"
+    + "".join(f"  {key}: {{{key}}},\n" for key in MOTION_CONSTANT_KEYS)
+    + "}} as const;"
+)
 
 
 def _render_ts(constants: Dict[str, float]) -> str:
+    if tuple(constants) == MOTION_CONSTANT_KEYS:
+        return _TS_TEMPLATE.format(**constants)
     lines = ["// Generated from OpenPose-style frames", "export const LOCOMOTION_TUNING = {"]
-    for key, value in constants.items():
-        lines.append(f"  {key}: {value},")
+    lines.extend(["  %s: %s," % item for item in constants.items()])
     lines.append("} as const;")
     return "\n".join(lines)
 
 
+def _dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode("utf-8")
+    return json.dumps(obj, indent=2, sort_keys=True)
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Convert local OpenPose keypoint frames into locomotion constants."
@@ -210,11 +252,11 @@ def main() -> None:
     args = parse_args()
     payload = _load_json(Path(args.input))
     frames = _load_frames(payload)
-    if not frames:
+    if not len(frames):
         raise SystemExit("No valid OpenPose-style frames found in input.")
     constants = derive_motion_constants(frames, min_conf=args.min_confidence)
     if args.format == "json":
-        print(json.dumps(constants, indent=2, sort_keys=True))
+        print(_dumps(constants))
     else:
         print(_render_ts(constants))
 